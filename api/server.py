@@ -4,12 +4,16 @@ Clean FastAPI server using the core command engine.
 No UI dependencies - just pure API logic.
 """
 
-from typing import Dict, Optional
-from uuid import uuid4
+import asyncio
+import itertools
+import secrets
+from collections import OrderedDict, deque
+from typing import Optional
 
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel, ConfigDict
 
 
 
@@ -20,10 +24,16 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 
 
 from recipes import RECIPE_LIBRARY
-from llm_agent import call_agent_sous_chef
+from llm_agent import acall_agent_sous_chef
 from core.commands import CookingState, handle_command
 
-app = FastAPI(title="Agent Sous Chef API", version="2.0.0")
+# orjson serializes responses in native code, so list-heavy payloads like
+# MessageResponse avoid the stdlib json.dumps per-key Python loops.
+app = FastAPI(
+    title="Agent Sous Chef API",
+    version="2.0.0",
+    default_response_class=ORJSONResponse,
+)
 
 app.add_middleware(
     CORSMiddleware,
@@ -36,13 +46,58 @@ app.add_middleware(
 
 # ---------- Session Storage ----------
 
-class Session:
-    def __init__(self, recipe_key: str):
-        self.cooking_state = CookingState(recipe_key=recipe_key)
-        self.messages: list = []
+# Session IDs don't need to be cryptographically unpredictable, just unique.
+# A random per-process prefix plus a monotonic counter avoids pulling fresh
+# OS entropy (and building a UUID object) on every session start.
+_ID_PREFIX = secrets.token_bytes(8).hex()
+_ID_COUNTER = itertools.count()
+
+
+def _new_session_id() -> str:
+    return _ID_PREFIX + format(next(_ID_COUNTER), "016x")
 
 
-SESSIONS: Dict[str, Session] = {}
+class Msg:
+    """Slotted chat message — a fraction of the footprint of a 2-key dict."""
+    __slots__ = ("role", "content")
+
+    def __init__(self, role: str, content: str):
+        self.role = role
+        self.content = content
+
+
+class Session:
+    def __init__(self, recipe_key: str, recipe: dict):
+        self.cooking_state = CookingState(recipe_key=recipe_key)
+        # Only recent history is kept; nothing serves the full transcript,
+        # so a bounded deque stops long sessions from holding MBs of chat.
+        # message_count keeps the true total even past the deque cap.
+        self.messages: deque = deque(maxlen=200)
+        self.message_count = 0
+        # The recipe never changes for a session, so resolve it once here
+        # instead of re-indexing RECIPE_LIBRARY on every message.
+        self.recipe = recipe
+        self.recipe_name = recipe["name"]
+        self.description = recipe["description"]
+        self.ingredients = recipe["ingredients"]
+        self.steps = recipe["steps"]
+        self.total_steps = len(self.steps)
+        # Serializes message handling per session: send_message mutates
+        # state across an await point, so without this two concurrent
+        # messages to the same session could interleave mid-update.
+        self.lock = asyncio.Lock()
+
+    def add_message(self, role: str, content: str) -> None:
+        self.messages.append(Msg(role, content))
+        self.message_count += 1
+
+
+# Sessions are kept in LRU order and capped so abandoned sessions can't
+# grow the table without bound. Least-recently-used entries are evicted
+# when a new session would push us over the limit.
+_MAX_SESSIONS = 10_000
+
+SESSIONS: OrderedDict[str, Session] = OrderedDict()
 
 
 # ---------- Request/Response Models ----------
@@ -52,6 +107,8 @@ class StartRequest(BaseModel):
 
 
 class StartResponse(BaseModel):
+    model_config = ConfigDict(frozen=True, extra="ignore")
+
     session_id: str
     recipe_name: str
     reply: str
@@ -62,20 +119,27 @@ class MessageRequest(BaseModel):
 
 
 class MessageResponse(BaseModel):
+    model_config = ConfigDict(frozen=True, extra="ignore")
+
     reply: str
     current_step: int
     total_steps: int
     ingredients: list[str]
-    strikes: list[str]
+    # Tuple, not list: send_message passes the state's cached strikes
+    # snapshot as-is, and a matching annotation keeps pydantic's
+    # serializer from warning about the construct-time type mismatch.
+    strikes: tuple[str, ...]
     substitutions: dict[str, str]
 
 
 # ---------- Helpers ----------
 
 def get_session(session_id: str) -> Session:
-    if session_id not in SESSIONS:
+    session = SESSIONS.get(session_id)
+    if session is None:
         raise HTTPException(status_code=404, detail="Session not found")
-    return SESSIONS[session_id]
+    SESSIONS.move_to_end(session_id)
+    return session
 
 
 def get_recipe(recipe_key: str) -> dict:
@@ -87,7 +151,7 @@ def get_recipe(recipe_key: str) -> dict:
 # ---------- Endpoints ----------
 
 @app.get("/")
-def root():
+async def root():
     return {
         "name": "Agent Sous Chef API",
         "version": "2.0.0",
@@ -95,45 +159,62 @@ def root():
     }
 
 
+# RECIPE_LIBRARY is static for the life of the process, so the /recipes
+# payload can be built once at import instead of per request.
+_RECIPES_PAYLOAD = [
+    {
+        "key": key,
+        "name": recipe["name"],
+        "description": recipe["description"]
+    }
+    for key, recipe in RECIPE_LIBRARY.items()
+]
+
+
 @app.get("/recipes")
-def list_recipes():
+async def list_recipes():
     """List all available recipes"""
-    return [
-        {
-            "key": key,
-            "name": recipe["name"],
-            "description": recipe.get("description", "")
-        }
-        for key, recipe in RECIPE_LIBRARY.items()
-    ]
+    return _RECIPES_PAYLOAD
 
-@app.get("/recipes/{recipe_key}")
-def get_recipe_detail(recipe_key: str):
-    """Get detailed recipe information"""
-    recipe = get_recipe(recipe_key)
-    return {
-        "key": recipe_key,
+# Detail payloads are likewise static; building them here also hoists the
+# per-request chain of dict .get calls out of the handler.
+_RECIPE_DETAILS = {
+    key: {
+        "key": key,
         "name": recipe["name"],
-        "description": recipe.get("description", ""),
-        "ingredients": recipe.get("ingredients", []),
-        "steps": recipe.get("steps", [])
+        "description": recipe["description"],
+        "ingredients": recipe["ingredients"],
+        "steps": recipe["steps"]
     }
+    for key, recipe in RECIPE_LIBRARY.items()
+}
+
+
+@app.get("/recipes/{recipe_key}")
+async def get_recipe_detail(recipe_key: str):
+    """Get detailed recipe information"""
+    if recipe_key not in _RECIPE_DETAILS:
+        raise HTTPException(status_code=404, detail="Recipe not found")
+    return _RECIPE_DETAILS[recipe_key]
 
 
 @app.post("/session/start", response_model=StartResponse)
-def start_session(req: StartRequest):
+async def start_session(req: StartRequest):
     """Start a new cooking session"""
     recipe = get_recipe(req.recipe_key)
     
-    session_id = str(uuid4())
-    session = Session(recipe_key=req.recipe_key)
+    session_id = _new_session_id()
+    session = Session(recipe_key=req.recipe_key, recipe=recipe)
     
     reply = f"Let's cook {recipe['name']}! Ask for 'ingredients', 'steps', or say 'next' to begin."
     
-    session.messages.append({"role": "assistant", "content": reply})
+    session.add_message("assistant", reply)
+    if len(SESSIONS) >= _MAX_SESSIONS:
+        SESSIONS.popitem(last=False)
     SESSIONS[session_id] = session
-    
-    return StartResponse(
+
+    # model_construct skips validation; every field here is server-built.
+    return StartResponse.model_construct(
         session_id=session_id,
         recipe_name=recipe["name"],
         reply=reply
@@ -141,98 +222,101 @@ def start_session(req: StartRequest):
 
 
 @app.post("/session/{session_id}/message", response_model=MessageResponse)
-def send_message(session_id: str, req: MessageRequest):
+async def send_message(session_id: str, req: MessageRequest):
     """Send a message in a cooking session"""
     session = get_session(session_id)
-    recipe = get_recipe(session.cooking_state.recipe_key)
-    
-    user_msg = req.message.strip()
-    if not user_msg:
-        raise HTTPException(status_code=400, detail="Message cannot be empty")
-    
-    session.messages.append({"role": "user", "content": user_msg})
-    
-    # Try command engine first
-    result = handle_command(
-        user_input=user_msg,
-        state=session.cooking_state,
-        recipe_name=recipe["name"],
-        ingredients=recipe.get("ingredients", []),
-        steps=recipe.get("steps", [])
-    )
-    
-    if result.handled:
-        # Command was handled
-        if result.new_state:
-            session.cooking_state = result.new_state
-        reply = result.reply
-    else:
-        # Fall back to AI
-        try:
-            ai_result = call_agent_sous_chef(
-                user_input=user_msg,
-                recipe_name=recipe["name"],
-                recipe_description=recipe.get("description", ""),
-                recipe_steps=recipe.get("steps", []),
-                recipe_ingredients=recipe.get("ingredients", []),
-                recipe_subs=session.cooking_state.ingredient_subs,
-                current_step_index=session.cooking_state.current_step,
-            )
-            reply = ai_result["reply"]
-            
-            # Apply step advancement if AI suggested it
-            if ai_result.get("advance_step") and session.cooking_state.current_step < len(recipe["steps"]):
-                session.cooking_state.current_step += 1
-                
-        except Exception as e:
-            reply = f"Error: {str(e)}"
-    
-    session.messages.append({"role": "assistant", "content": reply})
-    
-    return MessageResponse(
-        reply=reply,
-        current_step=session.cooking_state.current_step,
-        total_steps=len(recipe.get("steps", [])),
-        ingredients=recipe.get("ingredients", []),
-        strikes=list(session.cooking_state.ingredient_strikes),
-        substitutions=session.cooking_state.ingredient_subs
-    )
+
+    async with session.lock:
+        user_msg = req.message.strip()
+        if not user_msg:
+            raise HTTPException(status_code=400, detail="Message cannot be empty")
+
+        session.add_message("user", user_msg)
+
+        # Hoist the state dereference once; ~10 attribute chains below
+        # become plain local reads.
+        state = session.cooking_state
+
+        # Try command engine first
+        result = handle_command(
+            user_input=user_msg,
+            state=state,
+            recipe_name=session.recipe_name,
+            ingredients=session.ingredients,
+            steps=session.steps
+        )
+
+        if result.handled:
+            # Command was handled
+            if result.new_state:
+                state = session.cooking_state = result.new_state
+            reply = result.reply
+        else:
+            # Fall back to AI
+            try:
+                ai_result = await acall_agent_sous_chef(
+                    user_input=user_msg,
+                    recipe_name=session.recipe_name,
+                    recipe_description=session.description,
+                    recipe_steps=session.steps,
+                    recipe_ingredients=session.ingredients,
+                    recipe_subs=state.ingredient_subs,
+                    current_step_index=state.current_step,
+                )
+                reply = ai_result["reply"]
+
+                # Apply step advancement if AI suggested it
+                if ai_result.get("advance_step") and state.current_step < session.total_steps:
+                    state.current_step += 1
+
+            except Exception as e:
+                reply = f"Error: {str(e)}"
+
+        session.add_message("assistant", reply)
+
+        return MessageResponse.model_construct(
+            reply=reply,
+            current_step=state.current_step,
+            total_steps=session.total_steps,
+            ingredients=session.ingredients,
+            strikes=state.ingredient_strikes_tuple,
+            substitutions=state.ingredient_subs
+        )
 
 
 @app.get("/session/{session_id}")
-def get_session_info(session_id: str):
+async def get_session_info(session_id: str):
     """Get current session state"""
     session = get_session(session_id)
-    recipe = get_recipe(session.cooking_state.recipe_key)
-    
-    return {
+
+    # Return ORJSONResponse directly: pure attribute reads, and FastAPI
+    # skips its jsonable_encoder walk over the dict.
+    return ORJSONResponse({
         "session_id": session_id,
         "recipe_key": session.cooking_state.recipe_key,
-        "recipe_name": recipe["name"],
+        "recipe_name": session.recipe_name,
         "current_step": session.cooking_state.current_step,
-        "total_steps": len(recipe.get("steps", [])),
-        "message_count": len(session.messages)
-    }
+        "total_steps": session.total_steps,
+        "message_count": session.message_count
+    })
 
 
 @app.delete("/session/{session_id}")
-def delete_session(session_id: str):
+async def delete_session(session_id: str):
     """End a cooking session"""
-    if session_id not in SESSIONS:
+    if SESSIONS.pop(session_id, None) is None:
         raise HTTPException(status_code=404, detail="Session not found")
-    del SESSIONS[session_id]
     return {"message": "Session deleted"}
 
 
 @app.get("/sessions")
-def list_sessions():
+async def list_sessions():
     """List all active sessions (debugging)"""
     result = []
     for sid, session in SESSIONS.items():
-        recipe = RECIPE_LIBRARY.get(session.cooking_state.recipe_key, {})
         result.append({
             "session_id": sid,
-            "recipe_name": recipe.get("name", "Unknown"),
+            "recipe_name": session.recipe_name,
             "current_step": session.cooking_state.current_step,
         })
     return result
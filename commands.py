@@ -0,0 +1,92 @@
+# commands.py
+"""
+Streamlit-facing command layer.
+
+Bridges the UI to the pure engine in core/commands.py: exposes the help
+text shown in the app and a handle_user_command wrapper that translates
+between st.session_state and the engine's CookingState.
+"""
+
+from typing import Dict, List
+
+import streamlit as st
+
+from core.commands import CookingState, handle_command
+
+
+COMMANDS_LONG_MARKDOWN = """
+**Commands**
+
+- `i` or `ingredients` — show the ingredient list
+- `s` or `steps` — show all steps with progress
+- `k`, `ok`, `next`, or `done` — mark the current step done and show the next one
+- `x 3` — mark steps 1-3 as complete
+- `x oil` — strike an ingredient off the list
+- `what` — show where you are in the recipe
+- a step number like `5` — show that step
+- anything else — ask the AI sous chef
+"""
+
+COMMANDS_CONDENSED = (
+    "Commands: `i` ingredients · `s` steps · `k`/`next` advance · "
+    "`x N` jump · `x <ingredient>` strike · `what` status — or just chat."
+)
+
+
+def _strikes_mask_to_set(mask: int, ingredients: List[str]) -> set:
+    return {ing for i, ing in enumerate(ingredients) if mask >> i & 1}
+
+
+def _strikes_set_to_mask(strikes: set, ingredients: List[str]) -> int:
+    mask = 0
+    for i, ing in enumerate(ingredients):
+        if ing in strikes:
+            mask |= 1 << i
+    return mask
+
+
+def handle_user_command(
+    user_input: str,
+    recipe_name: str,
+    recipe_description: str,
+    recipe_steps: List[str],
+    recipe_ingredients: List[str],
+    recipe_subs: Dict[str, str],
+) -> Dict[str, object]:
+    """
+    Run user_input through the core command engine, syncing any state
+    changes back into st.session_state for the active recipe.
+    """
+    recipe_key = st.session_state.recipe_key
+
+    state = CookingState(
+        recipe_key=recipe_key,
+        current_step=st.session_state.current_step,
+        ingredient_subs=recipe_subs,
+        ingredient_strikes=_strikes_mask_to_set(
+            st.session_state.ingredient_strikes.get(recipe_key, 0),
+            recipe_ingredients,
+        ),
+    )
+
+    result = handle_command(
+        user_input=user_input,
+        state=state,
+        recipe_name=recipe_name,
+        ingredients=recipe_ingredients,
+        steps=recipe_steps,
+    )
+
+    if result.handled and result.new_state is not None:
+        new_state = result.new_state
+        st.session_state.current_step = new_state.current_step
+        st.session_state.ingredient_subs[recipe_key] = new_state.ingredient_subs
+        st.session_state.ingredient_strikes[recipe_key] = _strikes_set_to_mask(
+            new_state.ingredient_strikes, recipe_ingredients
+        )
+
+    return {
+        "handled": result.handled,
+        "reply_text": result.reply,
+        "advance_step": result.advance_step,
+    }
@@ -5,10 +5,28 @@ All state is passed in and returned - no global state.
 """
 
 import re
-from typing import List, Dict, Set, Optional
+from functools import lru_cache
+from typing import List, Dict, Set, Optional, Tuple
 from dataclasses import dataclass, field
 
 
+# Compiled once at import: handle_command runs on every chat message, so
+# the patterns shouldn't pay the re-module cache probe per call.
+_JUMP_RE = re.compile(r"^x\s+(\d+)$")
+_STRIKE_RE = re.compile(r"^x\s+(.+)$")
+_STEP_NUM_RE = re.compile(r"^(\d+)$")
+
+
+@lru_cache(maxsize=32)
+def _lowered(ingredients: Tuple[str, ...]) -> Tuple[str, ...]:
+    """Lowercased copy of an ingredient tuple, cached per recipe.
+
+    Ingredient lists are fixed per recipe, so the per-strike-command
+    ing.lower() loop collapses to a cache hit after the first match.
+    """
+    return tuple(ing.lower() for ing in ingredients)
+
+
 @dataclass
 class CookingState:
     """Complete state for a cooking session"""
@@ -16,6 +34,16 @@ class CookingState:
     current_step: int = 0
     ingredient_subs: Dict[str, str] = field(default_factory=dict)
     ingredient_strikes: Set[str] = field(default_factory=set)
+    # Lazily-built snapshot of ingredient_strikes. Safe to cache because
+    # handle_command never mutates a state in place - it returns a fresh
+    # CookingState whenever the strike set changes.
+    _strikes_tuple: Optional[tuple] = field(default=None, repr=False, compare=False)
+
+    @property
+    def ingredient_strikes_tuple(self) -> tuple:
+        if self._strikes_tuple is None:
+            self._strikes_tuple = tuple(self.ingredient_strikes)
+        return self._strikes_tuple
 
 
 @dataclass
@@ -49,8 +77,8 @@ def format_ingredient_list(
     return "\n".join(lines)
 
 
-def format_steps_list(steps: List[str], current_step: int) -> str:
-    """Format steps with progress markers"""
+@lru_cache(maxsize=64)
+def _format_steps_cached(steps: Tuple[str, ...], current_step: int) -> str:
     lines = []
     for idx, step in enumerate(steps):
         if idx < current_step:
@@ -60,6 +88,114 @@ def format_steps_list(steps: List[str], current_step: int) -> str:
     return "\n".join(lines)
 
 
+def format_steps_list(steps: List[str], current_step: int) -> str:
+    """Format steps with progress markers.
+
+    Cached on (steps, position): repeated "s"/"what"/jump replies at the
+    same point in the recipe reuse the assembled string.
+    """
+    return _format_steps_cached(tuple(steps), current_step)
+
+
+def _cmd_ingredients(
+    state: CookingState,
+    recipe_name: str,
+    ingredients: List[str],
+    steps: List[str],
+) -> CommandResult:
+    """Command: Show ingredients"""
+    reply = "**Ingredients:**\n\n" + format_ingredient_list(
+        ingredients,
+        state.ingredient_subs,
+        state.ingredient_strikes
+    )
+    return CommandResult(handled=True, reply=reply)
+
+
+def _cmd_steps(
+    state: CookingState,
+    recipe_name: str,
+    ingredients: List[str],
+    steps: List[str],
+) -> CommandResult:
+    """Command: Show steps"""
+    reply = "**Steps:**\n\n" + format_steps_list(steps, state.current_step)
+    return CommandResult(handled=True, reply=reply)
+
+
+def _cmd_next(
+    state: CookingState,
+    recipe_name: str,
+    ingredients: List[str],
+    steps: List[str],
+) -> CommandResult:
+    """Command: Next step"""
+    if state.current_step >= len(steps):
+        return CommandResult(
+            handled=True,
+            reply="You've completed all steps! 🎉"
+        )
+
+    step_num = state.current_step + 1
+    step_text = steps[state.current_step]
+
+    new_state = CookingState(
+        recipe_key=state.recipe_key,
+        current_step=state.current_step + 1,
+        ingredient_subs=state.ingredient_subs.copy(),
+        ingredient_strikes=state.ingredient_strikes.copy()
+    )
+
+    return CommandResult(
+        handled=True,
+        reply=f"**Step {step_num}:**\n\n{step_text}",
+        new_state=new_state
+    )
+
+
+def _cmd_what(
+    state: CookingState,
+    recipe_name: str,
+    ingredients: List[str],
+    steps: List[str],
+) -> CommandResult:
+    """Command: What (show current status)"""
+    lines = [f"**Cooking: {recipe_name}**\n"]
+
+    if ingredients:
+        lines.append("**Ingredients:**")
+        lines.append(format_ingredient_list(
+            ingredients,
+            state.ingredient_subs,
+            state.ingredient_strikes
+        ))
+        lines.append("")
+
+    if state.current_step < len(steps):
+        step_num = state.current_step + 1
+        lines.append(f"**Current Step ({step_num}/{len(steps)}):**")
+        lines.append(steps[state.current_step])
+    else:
+        lines.append("✅ All steps complete!")
+
+    return CommandResult(handled=True, reply="\n".join(lines))
+
+
+# Exact single-token commands dispatch through one dict lookup instead of
+# a chain of list-membership scans.
+_EXACT_CMDS = {
+    "i": _cmd_ingredients,
+    "ingredients": _cmd_ingredients,
+    "s": _cmd_steps,
+    "steps": _cmd_steps,
+    "k": _cmd_next,
+    "ok": _cmd_next,
+    "next": _cmd_next,
+    "done": _cmd_next,
+    "what": _cmd_what,
+}
+
+
 def handle_command(
     user_input: str,
     state: CookingState,
@@ -72,47 +208,17 @@ def handle_command(
     Pure function - no side effects, no global state.
     """
     lower = user_input.lower().strip()
-    
-    # Command: Show ingredients
-    if lower in ["i", "ingredients"]:
-        reply = "**Ingredients:**\n\n" + format_ingredient_list(
-            ingredients,
-            state.ingredient_subs,
-            state.ingredient_strikes
-        )
-        return CommandResult(handled=True, reply=reply)
-    
-    # Command: Show steps
-    if lower in ["s", "steps"]:
-        reply = "**Steps:**\n\n" + format_steps_list(steps, state.current_step)
-        return CommandResult(handled=True, reply=reply)
-    
-    # Command: Next step
-    if lower in ["k", "ok", "next", "done"]:
-        if state.current_step >= len(steps):
-            return CommandResult(
-                handled=True,
-                reply="You've completed all steps! 🎉"
-            )
-        
-        step_num = state.current_step + 1
-        step_text = steps[state.current_step]
-        
-        new_state = CookingState(
-            recipe_key=state.recipe_key,
-            current_step=state.current_step + 1,
-            ingredient_subs=state.ingredient_subs.copy(),
-            ingredient_strikes=state.ingredient_strikes.copy()
-        )
-        
-        return CommandResult(
-            handled=True,
-            reply=f"**Step {step_num}:**\n\n{step_text}",
-            new_state=new_state
-        )
-    
+
+    # Blank input can't match anything; skip the dispatch entirely.
+    if not lower:
+        return CommandResult(handled=False, reply="")
+
+    handler = _EXACT_CMDS.get(lower)
+    if handler is not None:
+        return handler(state, recipe_name, ingredients, steps)
+
     # Command: Jump to step N (e.g., "x 3" marks steps 1-3 done)
-    step_match = re.match(r"^x\s+(\d+)$", lower)
+    step_match = _JUMP_RE.match(lower)
     if step_match:
         n = int(step_match.group(1))
         n = max(0, min(n, len(steps)))
@@ -135,12 +241,16 @@ def handle_command(
         )
     
     # Command: Strike ingredient (e.g., "x oil")
-    strike_match = re.match(r"^x\s+(.+)$", lower)
+    strike_match = _STRIKE_RE.match(lower)
     if strike_match:
         target = strike_match.group(1).strip()
         
         # Find matching ingredients
-        matches = [ing for ing in ingredients if target in ing.lower()]
+        matches = [
+            ing
+            for ing, ing_lower in zip(ingredients, _lowered(tuple(ingredients)))
+            if target in ing_lower
+        ]
         
         if not matches:
             return CommandResult(
@@ -170,30 +280,8 @@ def handle_command(
             new_state=new_state
         )
     
-    # Command: What (show current status)
-    if lower == "what":
-        lines = [f"**Cooking: {recipe_name}**\n"]
-        
-        if ingredients:
-            lines.append("**Ingredients:**")
-            lines.append(format_ingredient_list(
-                ingredients,
-                state.ingredient_subs,
-                state.ingredient_strikes
-            ))
-            lines.append("")
-        
-        if state.current_step < len(steps):
-            step_num = state.current_step + 1
-            lines.append(f"**Current Step ({step_num}/{len(steps)}):**")
-            lines.append(steps[state.current_step])
-        else:
-            lines.append("✅ All steps complete!")
-        
-        return CommandResult(handled=True, reply="\n".join(lines))
-    
     # Command: Show specific step number
-    num_match = re.match(r"^(\d+)$", user_input.strip())
+    num_match = _STEP_NUM_RE.match(user_input.strip())
     if num_match:
         step_num = int(num_match.group(1))
         if 1 <= step_num <= len(steps):
@@ -1,11 +1,16 @@
-import json
-from typing import List, Dict, Any
+import hashlib
+import re
+
+import orjson
+from collections import OrderedDict
+from typing import Iterator, List, Dict, Any
 import os
-from openai import OpenAI
+from openai import AsyncOpenAI, OpenAI
 from typing import Optional
 
 
 _client: Optional[OpenAI] = None
+_async_client: Optional[AsyncOpenAI] = None
 
 
 def get_client() -> OpenAI:
@@ -25,44 +30,82 @@ def get_client() -> OpenAI:
     return _client
 
 
-SYSTEM_INSTRUCTIONS = """
-You are Agent Sous Chef — a friendly, concise AI cooking assistant.
-You help users cook step by step with clarity and calm encouragement.
-
-You must always respond as a strict JSON object with two keys:
-- "reply": a short natural-language message to the user
-- "advance_step": a boolean (true or false) indicating whether the app should move to the next step
-
-Format example:
-{
-  "reply": "Some helpful message to the user.",
-  "advance_step": false
-}
-
-Rules:
-- Speak clearly and briefly.
-- Focus on the current step unless it is clearly completed.
-- If the user says things like "done", "finished", or clearly describes completing the current step, set "advance_step" to true.
-- If the user asks "what is next" or similar, and the current step seems complete, set "advance_step" to true.
-- If the user is asking for ingredient substitutions, suggest 1–3 simple alternatives and set "advance_step": false.
-- If you are at the final step, and it is complete, use "advance_step": false and wrap up the recipe politely.
-- Do not add any extra keys to the JSON.
-- Do not include backticks or explanations outside the JSON.
-"""
+def get_async_client() -> AsyncOpenAI:
+    """Return a cached AsyncOpenAI client, creating it on first use.
 
+    Async handlers await their completions instead of parking a worker
+    thread on the socket for the duration of the call.
+    """
+    global _async_client
 
-def call_agent_sous_chef(
-    user_input: str,
+    if _async_client is None:
+        api_key = os.getenv("OPENAI_API_KEY")
+        if not api_key:
+            raise RuntimeError("OPENAI_API_KEY is not set. Please configure it in your environment.")
+        _async_client = AsyncOpenAI(api_key=api_key)
+
+    return _async_client
+
+
+SYSTEM_INSTRUCTIONS = (
+    "You are Agent Sous Chef, a friendly, concise AI cooking assistant. "
+    'Respond only with a JSON object {"reply": str, "advance_step": bool}. '
+    "Keep replies short and focused on the current step. Set advance_step "
+    "true when the user signals the current step is done or asks what is "
+    "next and the step seems complete; keep it false on the final step. "
+    "For substitution questions suggest 1-3 simple alternatives and keep "
+    "advance_step false."
+)
+
+
+# Recipe-invariant context blocks, keyed by recipe name. Keeping this text
+# byte-identical across turns lets the provider's prompt-prefix cache hit
+# on system prompt + recipe block for every message within a recipe.
+_STATIC_BLOCK_CACHE: Dict[str, str] = {}
+
+
+def _static_recipe_block(
     recipe_name: str,
     recipe_description: str,
     recipe_steps: List[str],
     recipe_ingredients: List[str],
+) -> str:
+    """Compose the stable, per-recipe part of the prompt."""
+
+    block = _STATIC_BLOCK_CACHE.get(recipe_name)
+    if block is None:
+        steps_text = (
+            "\n".join(f"{i+1}. {s}" for i, s in enumerate(recipe_steps))
+            if recipe_steps else "None"
+        )
+        ingredients_text = (
+            "\n".join(f"- {ing}" for ing in recipe_ingredients)
+            if recipe_ingredients else "None"
+        )
+        block = f"""
+Active recipe: {recipe_name}
+Recipe description: {recipe_description}
+
+Ingredients:
+{ingredients_text}
+
+All steps:
+{steps_text}
+"""
+        _STATIC_BLOCK_CACHE[recipe_name] = block
+    return block
+
+
+def _dynamic_context_block(
+    user_input: str,
+    recipe_steps: List[str],
     recipe_subs: Dict[str, str],
     current_step_index: int,
-) -> Dict[str, Any]:
-    """
-    Core LLM call helper. Pure function: no Streamlit inside,
-    and receives all required context via arguments.
+) -> str:
+    """Compose the per-message part of the prompt.
+
+    Substitutions are emitted here as a short diff rather than woven into
+    the ingredient list, so the static recipe block above stays stable.
     """
 
     steps = recipe_steps
@@ -74,70 +117,111 @@ def call_agent_sous_chef(
     if steps:
         if current_step_index >= len(steps):
             current_step_index = len(steps) - 1
-
         current_step_text = steps[current_step_index]
-        completed_steps = steps[:current_step_index]
-        remaining_steps = steps[current_step_index + 1:]
-        steps_text = "\n".join(f"{i+1}. {s}" for i, s in enumerate(steps))
-
     else:
         current_step_text = "No steps defined."
-        completed_steps = []
-        remaining_steps = []
-        steps_text = "None"
-
-    # Compose ingredients block
-    if recipe_ingredients:
-        ingredient_lines = []
-        for ing in recipe_ingredients:
-            sub_name = recipe_subs.get(ing)
-            if sub_name:
-                ingredient_lines.append(f"- {ing} (substitute: {sub_name})")
-            else:
-                ingredient_lines.append(f"- {ing}")
-        ingredients_block = "\n".join(ingredient_lines)
+
+    if recipe_subs:
+        subs_block = "\n".join(f"- {sub} instead of {orig}" for orig, sub in recipe_subs.items())
     else:
-        ingredients_block = "None"
+        subs_block = "None"
 
-    # Format context for the LLM
-    user_context = f"""
+    return f"""
 User message: {user_input}
 
-Active recipe: {recipe_name}
-Recipe description: {recipe_description}
+Substitutions in effect:
+{subs_block}
 
-Ingredients:
-{ingredients_block}
+Current step {current_step_index + 1} of {len(steps)}: {current_step_text}
+"""
 
-All steps:
-{steps_text}
 
-Current step index (1-based): {current_step_index + 1}
-Current step text: {current_step_text}
+def _build_messages(
+    user_input: str,
+    recipe_name: str,
+    recipe_description: str,
+    recipe_steps: List[str],
+    recipe_ingredients: List[str],
+    recipe_subs: Dict[str, str],
+    current_step_index: int,
+) -> List[Dict[str, str]]:
+    """Assemble the chat messages: stable prefix first, dynamic tail last."""
+
+    return [
+        {"role": "system", "content": SYSTEM_INSTRUCTIONS},
+        {
+            "role": "user",
+            "content": _static_recipe_block(
+                recipe_name, recipe_description, recipe_steps, recipe_ingredients
+            ),
+        },
+        {
+            "role": "user",
+            "content": _dynamic_context_block(
+                user_input, recipe_steps, recipe_subs, current_step_index
+            ),
+        },
+    ]
+
+
+def _max_tokens_for(current_step_index: int, total_steps: int) -> int:
+    """Output budget for a turn.
+
+    Mid-recipe answers are short by instruction; only the final step's
+    wrap-up gets extra room. A smaller budget trims decode latency on
+    the common case.
+    """
+    if total_steps and current_step_index >= total_steps - 1:
+        return 200
+    return 120
 
-Completed steps:
-{chr(10).join(f"- {s}" for s in completed_steps) if completed_steps else "None"}
 
-Remaining steps:
-{chr(10).join(f"- {s}" for s in remaining_steps) if remaining_steps else "None"}
-"""
+# Many free-text inputs ("done", "how long do I boil pasta") repeat with
+# identical recipe/step context, so successful completions are cached in a
+# small LRU keyed by a hash of everything that shapes the answer. This
+# module is shared by the API and the UI, so the cache lives here rather
+# than behind a Streamlit decorator.
+_RESPONSE_CACHE: OrderedDict = OrderedDict()
+_RESPONSE_CACHE_MAX = 2048
 
-    # Call the OpenAI client
-    client = get_client()
-    completion = client.chat.completions.create(
-        model="gpt-4o-mini",
-        messages=[
-            {"role": "system", "content": SYSTEM_INSTRUCTIONS},
-            {"role": "user", "content": user_context},
-        ],
-        max_tokens=300,
+
+def _response_cache_key(
+    user_input: str,
+    recipe_name: str,
+    recipe_steps: List[str],
+    recipe_subs: Dict[str, str],
+    current_step_index: int,
+) -> str:
+    payload = orjson.dumps(
+        [
+            recipe_name,
+            current_step_index,
+            len(recipe_steps),
+            user_input.lower().strip(),
+            sorted(recipe_subs.items()),
+        ]
     )
+    return hashlib.blake2b(payload, digest_size=16).hexdigest()
 
-    raw = completion.choices[0].message.content.strip()
 
-    # Try to parse the JSON
+def _response_cache_get(key: str) -> Optional[Dict[str, Any]]:
+    hit = _RESPONSE_CACHE.get(key)
+    if hit is not None:
+        _RESPONSE_CACHE.move_to_end(key)
+    return hit
+
+
+def _response_cache_put(key: str, result: Dict[str, Any]) -> None:
+    _RESPONSE_CACHE[key] = result
+    if len(_RESPONSE_CACHE) > _RESPONSE_CACHE_MAX:
+        _RESPONSE_CACHE.popitem(last=False)
+
+
+def _parse_agent_response(raw: str) -> Dict[str, Any]:
+    """Parse the model's strict-JSON response into the result dict."""
+
     try:
-        data = json.loads(raw)
+        data = orjson.loads(raw)
         if not isinstance(data, dict):
             raise ValueError("Response JSON is not an object")
 
@@ -154,29 +238,217 @@ Remaining steps:
         }
 
     except Exception:
-        # Fallback naive advancing
-        lower = user_input.lower()
-        clean = "".join(ch for ch in lower if ch.isalnum() or ch.isspace())
-
-        advance_triggers = [
-            "done",
-            "finished",
-            "next",
-            "next step",
-            "whats next",
-            "what is next",
-            "ok",
-            "okay",
-            "k",
-            "kk",
-        ]
-
-        naive_advance = any(
-            trigger == clean or trigger in clean for trigger in advance_triggers
-        )
-
+        # JSON mode makes this effectively unreachable; if it does fire,
+        # surface the raw text and never advance on a guess.
         return {
             "reply": raw,
-            "advance_step": naive_advance,
+            "advance_step": False,
             "raw": raw,
-        }
\ No newline at end of file
+        }
+
+
+def call_agent_sous_chef(
+    user_input: str,
+    recipe_name: str,
+    recipe_description: str,
+    recipe_steps: List[str],
+    recipe_ingredients: List[str],
+    recipe_subs: Dict[str, str],
+    current_step_index: int,
+) -> Dict[str, Any]:
+    """
+    Core LLM call helper. Pure function: no Streamlit inside,
+    and receives all required context via arguments.
+    """
+
+    cache_key = _response_cache_key(
+        user_input, recipe_name, recipe_steps, recipe_subs, current_step_index
+    )
+    cached = _response_cache_get(cache_key)
+    if cached is not None:
+        return cached
+
+    messages = _build_messages(
+        user_input=user_input,
+        recipe_name=recipe_name,
+        recipe_description=recipe_description,
+        recipe_steps=recipe_steps,
+        recipe_ingredients=recipe_ingredients,
+        recipe_subs=recipe_subs,
+        current_step_index=current_step_index,
+    )
+
+    # Call the OpenAI client
+    client = get_client()
+    completion = client.chat.completions.create(
+        model="gpt-4o-mini",
+        messages=messages,
+        max_tokens=_max_tokens_for(current_step_index, len(recipe_steps)),
+        temperature=0,
+        response_format={"type": "json_object"},
+    )
+
+    raw = completion.choices[0].message.content.strip()
+    result = _parse_agent_response(raw)
+    _response_cache_put(cache_key, result)
+    return result
+
+
+async def acall_agent_sous_chef(
+    user_input: str,
+    recipe_name: str,
+    recipe_description: str,
+    recipe_steps: List[str],
+    recipe_ingredients: List[str],
+    recipe_subs: Dict[str, str],
+    current_step_index: int,
+) -> Dict[str, Any]:
+    """Async counterpart to call_agent_sous_chef for async API handlers."""
+
+    cache_key = _response_cache_key(
+        user_input, recipe_name, recipe_steps, recipe_subs, current_step_index
+    )
+    cached = _response_cache_get(cache_key)
+    if cached is not None:
+        return cached
+
+    messages = _build_messages(
+        user_input=user_input,
+        recipe_name=recipe_name,
+        recipe_description=recipe_description,
+        recipe_steps=recipe_steps,
+        recipe_ingredients=recipe_ingredients,
+        recipe_subs=recipe_subs,
+        current_step_index=current_step_index,
+    )
+
+    client = get_async_client()
+    completion = await client.chat.completions.create(
+        model="gpt-4o-mini",
+        messages=messages,
+        max_tokens=_max_tokens_for(current_step_index, len(recipe_steps)),
+        temperature=0,
+        response_format={"type": "json_object"},
+    )
+
+    raw = completion.choices[0].message.content.strip()
+    result = _parse_agent_response(raw)
+    _response_cache_put(cache_key, result)
+    return result
+
+
+# --- Streaming variant ---
+
+# Locates the start of the "reply" string value inside the (possibly
+# incomplete) JSON the model streams back.
+_REPLY_VALUE_RE = re.compile(r'"reply"\s*:\s*"')
+
+# Trailing fragment of an escape sequence (a dangling backslash or an
+# unfinished \uXXXX) that must be held back until more text arrives.
+_PARTIAL_ESCAPE_RE = re.compile(r'(?:\\u[0-9a-fA-F]{0,3}|\\)$')
+
+
+def _extract_partial_reply(raw: str) -> str:
+    """Return the decoded prefix of the "reply" value available so far."""
+
+    match = _REPLY_VALUE_RE.search(raw)
+    if not match:
+        return ""
+
+    body = raw[match.end():]
+
+    # Cut at the closing quote of the value, skipping escaped quotes.
+    end = 0
+    while end < len(body):
+        if body[end] == "\\":
+            end += 2
+            continue
+        if body[end] == '"':
+            break
+        end += 1
+    body = body[:end]
+
+    if "\\" not in body:
+        return body
+
+    # Drop an escape sequence still in flight, then decode the rest.
+    body = _PARTIAL_ESCAPE_RE.sub("", body)
+    try:
+        return orjson.loads(f'"{body}"')
+    except ValueError:
+        return ""
+
+
+class AgentReplyStream:
+    """Streaming counterpart to call_agent_sous_chef.
+
+    Iterating yields chunks of the model's "reply" text as tokens arrive,
+    so a UI can render before the full completion finishes. Once the
+    iterator is exhausted, `reply`, `advance_step`, and `raw` hold the
+    same values call_agent_sous_chef would have returned.
+    """
+
+    def __init__(self, **call_kwargs: Any):
+        self._call_kwargs = call_kwargs
+        self.reply: str = ""
+        self.advance_step: bool = False
+        self.raw: str = ""
+
+    def __iter__(self) -> Iterator[str]:
+        kwargs = self._call_kwargs
+        cache_key = _response_cache_key(
+            kwargs["user_input"],
+            kwargs["recipe_name"],
+            kwargs["recipe_steps"],
+            kwargs["recipe_subs"],
+            kwargs["current_step_index"],
+        )
+        cached = _response_cache_get(cache_key)
+        if cached is not None:
+            self.raw = cached["raw"]
+            self.reply = cached["reply"]
+            self.advance_step = cached["advance_step"]
+            yield self.reply
+            return
+
+        messages = _build_messages(**kwargs)
+
+        client = get_client()
+        stream = client.chat.completions.create(
+            model="gpt-4o-mini",
+            messages=messages,
+            max_tokens=_max_tokens_for(
+                self._call_kwargs["current_step_index"],
+                len(self._call_kwargs["recipe_steps"]),
+            ),
+            temperature=0,
+            response_format={"type": "json_object"},
+            stream=True,
+        )
+
+        pieces: List[str] = []
+        emitted = ""
+        for chunk in stream:
+            delta = chunk.choices[0].delta.content
+            if not delta:
+                continue
+            pieces.append(delta)
+            reply_so_far = _extract_partial_reply("".join(pieces))
+            if len(reply_so_far) > len(emitted):
+                yield reply_so_far[len(emitted):]
+                emitted = reply_so_far
+
+        self.raw = "".join(pieces).strip()
+        result = _parse_agent_response(self.raw)
+        self.reply = result["reply"]
+        self.advance_step = result["advance_step"]
+        _response_cache_put(cache_key, result)
+
+        # Emit whatever the incremental extractor missed (e.g. a fallback
+        # reply when the model didn't return valid JSON).
+        if self.reply.startswith(emitted):
+            tail = self.reply[len(emitted):]
+            if tail:
+                yield tail
+        elif not emitted:
+            yield self.reply
@@ -1,6 +1,8 @@
 from __future__ import annotations
 
 import json
+import sys
+from functools import lru_cache
 from pathlib import Path
 from typing import Dict, Any, List, Tuple
 
@@ -59,6 +61,27 @@ _BUILTIN_RECIPES: Dict[str, Dict[str, Any]] = {
 }
 
 
+def _normalize_recipes(data: Dict[str, Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+    """
+    Guarantee every recipe carries name/description/ingredients/steps so
+    consumers can index directly instead of calling .get() with fresh
+    default objects on every access.
+
+    Strings are interned so equal names/ingredients/steps share a single
+    object across the library — equality checks (e.g. strike matching)
+    become pointer comparisons and duplicates don't cost extra heap.
+    """
+    intern = sys.intern
+    for key, recipe in data.items():
+        recipe.setdefault("key", key)
+        recipe.setdefault("name", key)
+        recipe.setdefault("description", "")
+        recipe["name"] = intern(recipe["name"])
+        recipe["ingredients"] = [intern(i) for i in recipe.get("ingredients", [])]
+        recipe["steps"] = [intern(s) for s in recipe.get("steps", [])]
+    return data
+
+
 def _load_recipe_library() -> Dict[str, Dict[str, Any]]:
     """
     Load recipes from data/recipes_internal.json if present;
@@ -69,25 +92,29 @@ def _load_recipe_library() -> Dict[str, Dict[str, Any]]:
             data = json.loads(RECIPES_JSON.read_text(encoding="utf-8"))
             # Expecting a dict of {key: {name, description, ingredients, steps, ...}}
             if isinstance(data, dict) and data:
-                return data
+                return _normalize_recipes(data)
         except Exception:
             # If anything goes wrong, just fall back to built-ins
             pass
 
     # Fallback: built-in examples
-    return _BUILTIN_RECIPES
+    return _normalize_recipes(_BUILTIN_RECIPES)
 
 
 # This is what the rest of the app imports
 RECIPE_LIBRARY: Dict[str, Dict[str, Any]] = _load_recipe_library()
 
 
+@lru_cache(maxsize=1)
 def get_recipe_keys_and_labels() -> List[Tuple[str, str]]:
     """
     Return a list of (key, label) pairs for recipe selection.
 
     Label is currently just the recipe name, but could be extended
     to include a short description in the future.
+
+    Memoized: RECIPE_LIBRARY never changes after import, and the UI
+    calls this on every rerun.
     """
     items: List[Tuple[str, str]] = []
     for key, data in RECIPE_LIBRARY.items():
@@ -95,4 +122,34 @@ def get_recipe_keys_and_labels() -> List[Tuple[str, str]]:
         items.append((key, label))
     # Sort alphabetically by label for nicer UI
     items.sort(key=lambda x: x[1].lower())
-    return items
\ No newline at end of file
+    return items
+
+
+@lru_cache(maxsize=1)
+def get_recipe_labels() -> Tuple[str, ...]:
+    """Selectbox labels in the same order as get_recipe_keys_and_labels()."""
+    return tuple(label for _, label in get_recipe_keys_and_labels())
+
+
+@lru_cache(maxsize=1)
+def get_recipe_key_to_index() -> Dict[str, int]:
+    """Map recipe key -> position in get_recipe_keys_and_labels()."""
+    return {key: i for i, (key, _) in enumerate(get_recipe_keys_and_labels())}
+
+
+@lru_cache(maxsize=1)
+def get_label_to_key() -> Dict[str, str]:
+    """Map selectbox label -> recipe key."""
+    return {label: key for key, label in get_recipe_keys_and_labels()}
+
+
+@lru_cache(maxsize=None)
+def get_recipe_step_lines(recipe_key: str) -> Tuple[str, ...]:
+    """Numbered "N. step" lines for a recipe, built once.
+
+    Steps are immutable after import, so callers that decorate these
+    lines (progress markers, strikethrough) only pay for the decoration,
+    not the numbering, on each render.
+    """
+    steps = RECIPE_LIBRARY[recipe_key]["steps"]
+    return tuple(f"{i + 1}. {s}" for i, s in enumerate(steps))
\ No newline at end of file
@@ -6,12 +6,18 @@ from typing import List, Dict, Any
 import re
 import streamlit as st
 
-from recipes import RECIPE_LIBRARY, get_recipe_keys_and_labels
+from recipes import (
+    RECIPE_LIBRARY,
+    get_label_to_key,
+    get_recipe_key_to_index,
+    get_recipe_labels,
+    get_recipe_step_lines,
+)
 from view_helpers import (
     format_working_ingredients_markdown,
     format_steps_with_progress_markdown,
 )
-from llm_agent import call_agent_sous_chef
+from llm_agent import AgentReplyStream
 from commands import COMMANDS_LONG_MARKDOWN, COMMANDS_CONDENSED, handle_user_command
 
 
@@ -44,8 +50,8 @@ if "ingredient_subs" not in st.session_state:
     st.session_state.ingredient_subs: Dict[str, Dict[str, str]] = {}
 
 if "ingredient_strikes" not in st.session_state:
-    # Per-recipe mapping: { recipe_key: set_of_original_ingredients_to_strike }
-    st.session_state.ingredient_strikes: Dict[str, set[str]] = {}
+    # Per-recipe mapping: { recipe_key: bitmask_over_ingredient_positions }
+    st.session_state.ingredient_strikes: Dict[str, int] = {}
 
 if "pending_recipe_pick" not in st.session_state:
     # When True, numeric input like "2" is treated as "pick recipe #2"
@@ -56,19 +62,31 @@ if "pick_candidates" not in st.session_state:
     st.session_state.pick_candidates = None
 
 
+# Keys this app owns in st.session_state. Resetting pops exactly these
+# instead of st.session_state.clear(), which would also tear down widget
+# state and Streamlit-internal entries and force them to be rebuilt.
+_APP_STATE_KEYS = (
+    "messages",
+    "current_step",
+    "ingredient_subs",
+    "ingredient_strikes",
+    "pending_recipe_pick",
+    "pick_candidates",
+)
+
+
 def reset_conversation_for_recipe(new_recipe_key: str) -> None:
-    """Fully reset ALL state when switching or restarting a recipe."""
-    # Clear all session state first
-    st.session_state.clear()
+    """Reset conversation state when switching or restarting a recipe."""
+    for key in _APP_STATE_KEYS:
+        st.session_state.pop(key, None)
 
-    # Restore the selected recipe key
     st.session_state.recipe_key = new_recipe_key
 
     # Fresh containers
     st.session_state.messages = []
     st.session_state.current_step = 0
     st.session_state.ingredient_subs = {new_recipe_key: {}}
-    st.session_state.ingredient_strikes = {new_recipe_key: set()}
+    st.session_state.ingredient_strikes = {new_recipe_key: 0}
     st.session_state.pending_recipe_pick = False
 
     recipe = RECIPE_LIBRARY[new_recipe_key]
@@ -91,14 +109,10 @@ if not st.session_state.messages:
 
 # --- Main layout: recipe choice, ingredients, and steps (no sidebar) ---
 
-recipe_items = get_recipe_keys_and_labels()
-recipe_labels = [label for _, label in recipe_items]
+recipe_labels = get_recipe_labels()
 
 current_recipe_key = st.session_state.recipe_key
-current_index = next(
-    (i for i, (key, _) in enumerate(recipe_items) if key == current_recipe_key),
-    0,
-)
+current_index = get_recipe_key_to_index().get(current_recipe_key, 0)
 
 st.markdown("## Recipe selection")
 selected_label = st.selectbox(
@@ -107,9 +121,7 @@ selected_label = st.selectbox(
     index=current_index,
 )
 
-selected_key = next(
-    key for key, label in recipe_items if label == selected_label
-)
+selected_key = get_label_to_key()[selected_label]
 
 if selected_key != st.session_state.recipe_key:
     reset_conversation_for_recipe(selected_key)
@@ -132,63 +144,78 @@ with col_left:
         st.markdown("#### Ingredients")
 
         # Get any strike marks for this recipe (ingredients user wants visually struck out)
-        strikes_for_recipe = st.session_state.ingredient_strikes.get(st.session_state.recipe_key, set())
+        strikes_for_recipe = st.session_state.ingredient_strikes.get(st.session_state.recipe_key, 0)
 
         lines = format_working_ingredients_markdown(
             recipe_ingredients,
             recipe_subs,
             strikes_for_recipe,
         )
-        for line in lines:
-            st.write(line)
+        # One markdown element instead of one st.write per ingredient, so
+        # a rerun ships a single delta rather than N of them.
+        st.markdown("\n".join(lines))
 
 with col_right:
     # Restart button: hard reset all state, keep the current recipe, and rerun
     if st.button("Restart this recipe"):
-        current_recipe = st.session_state.recipe_key if "recipe_key" in st.session_state else None
-        st.session_state.clear()
-        if current_recipe is not None:
-            st.session_state.recipe_key = current_recipe
+        reset_conversation_for_recipe(st.session_state.recipe_key)
         st.rerun()
 
     st.markdown("#### Steps")
 
     # Use simple text markers instead of checkboxes:
     # [x] = completed, -> = current, no prefix = not started yet
-    for idx, step in enumerate(recipe_steps):
-        if idx < st.session_state.current_step:
-            prefix = "[x]"
-        elif idx == st.session_state.current_step:
-            prefix = "->"
-        else:
-            prefix = ""  # no prefix for not-yet-done steps
-        if prefix:
-            st.write(f"{prefix} {idx + 1}. {step}")
-        else:
-            st.write(f"{idx + 1}. {step}")
+    # Emit one markdown blob instead of one st.write per step so each
+    # rerun diffs a single element rather than N of them.
+    numbered_lines = get_recipe_step_lines(st.session_state.recipe_key)
+    cs = st.session_state.current_step
+    # Three slices instead of a per-step branch: done, current, upcoming.
+    step_lines = ["[x] " + line for line in numbered_lines[:cs]]
+    if cs < len(numbered_lines):
+        step_lines.append("-> " + numbered_lines[cs])
+    step_lines.extend(numbered_lines[cs + 1:])
+    st.markdown("\n\n".join(step_lines))
 
     st.caption("MVP: multiple recipes, ingredients, step tracking, and AI guidance.")
 
-# --- Display chat history ---
-
-for msg in st.session_state.messages:
-    with st.chat_message(msg["role"]):
-        st.markdown(msg["content"])
-
-# --- Chat input ---
-user_input = st.chat_input("Talk to Agent Sous Chef...")
+# --- Chat area: history, input, and handler ---
+
+# One fragment covers the whole chat flow, so a chat submission reruns
+# only this block — the recipe columns above stay untouched unless the
+# command actually moved the cooking state, in which case we escalate to
+# a full-app rerun so the columns catch up.
+# Only the most recent messages are rendered; the full transcript stays
+# in session state, but per-rerun render cost is bounded instead of
+# growing with the length of the cooking session.
+_HISTORY_RENDER_WINDOW = 20
+
+
+@st.fragment
+def _chat_area() -> None:
+    messages = st.session_state.messages
+    hidden = len(messages) - _HISTORY_RENDER_WINDOW
+    if hidden > 0:
+        st.caption(f"… {hidden} earlier messages hidden")
+        messages = messages[-_HISTORY_RENDER_WINDOW:]
+    for msg in messages:
+        with st.chat_message(msg["role"]):
+            st.markdown(msg["content"])
+
+    user_input = st.chat_input("Talk to Agent Sous Chef...")
+    if not user_input or not user_input.strip():
+        return
+
+    recipe_key = st.session_state.recipe_key
+    state_before = (
+        st.session_state.current_step,
+        st.session_state.ingredient_strikes.get(recipe_key, 0),
+    )
 
-if user_input:
     # Show user message
     st.session_state.messages.append({"role": "user", "content": user_input})
     with st.chat_message("user"):
         st.markdown(user_input)
 
-    lower = user_input.lower().strip()
-    handled = False
-    reply_text = ""
-    advance_step = False
-
     # First, let the central command engine try to handle this input.
     command_result = handle_user_command(
         user_input=user_input,
@@ -202,10 +229,13 @@ if user_input:
     reply_text = command_result.get("reply_text", "") or ""
     advance_step = command_result.get("advance_step", False)
 
-    # If the command engine did not handle this, fall back to the LLM
+    # If the command engine did not handle this, fall back to the LLM.
+    # The reply streams into the chat as tokens arrive, so the user sees
+    # text at time-to-first-token instead of after the full completion.
+    streamed = False
     if not handled:
         try:
-            result = call_agent_sous_chef(
+            streamer = AgentReplyStream(
                 user_input=user_input,
                 recipe_name=recipe_name,
                 recipe_description=recipe_description,
@@ -214,8 +244,11 @@ if user_input:
                 recipe_subs=recipe_subs,
                 current_step_index=st.session_state.current_step,
             )
-            reply_text = result["reply"]
-            advance_step = result["advance_step"]
+            with st.chat_message("assistant"):
+                st.write_stream(iter(streamer))
+            reply_text = streamer.reply
+            advance_step = streamer.advance_step
+            streamed = True
         except Exception as e:
             reply_text = f"Error calling the AI model: {e}"
             advance_step = False
@@ -227,7 +260,18 @@ if user_input:
     if advance_step and st.session_state.current_step < len(recipe_steps):
         st.session_state.current_step += 1
 
-    # Append and display assistant message
+    # Append the assistant message; display it unless it already streamed in
     st.session_state.messages.append({"role": "assistant", "content": reply_text})
-    with st.chat_message("assistant"):
-        st.markdown(reply_text)
\ No newline at end of file
+    if not streamed:
+        with st.chat_message("assistant"):
+            st.markdown(reply_text)
+
+    state_after = (
+        st.session_state.current_step,
+        st.session_state.ingredient_strikes.get(recipe_key, 0),
+    )
+    if state_after != state_before:
+        st.rerun()
+
+
+_chat_area()
\ No newline at end of file
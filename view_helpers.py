@@ -1,36 +1,70 @@
-from typing import List, Dict, Set
+from functools import lru_cache
+from typing import List, Dict, Tuple
 
 
-def format_working_ingredients_markdown(
-    recipe_ingredients: List[str],
-    recipe_subs: Dict[str, str],
-    strikes: Set[str],
+@lru_cache(maxsize=32)
+def _render_working_ingredients(
+    ingredients: Tuple[str, ...],
+    subs_items: Tuple[Tuple[str, str], ...],
+    strikes_mask: int,
 ) -> List[str]:
-    """Return markdown lines (bullets) for current ingredient state."""
+    subs = dict(subs_items)
     lines: List[str] = []
-    for ing in recipe_ingredients:
-        sub_name = recipe_subs.get(ing)
+    for idx, ing in enumerate(ingredients):
+        sub_name = subs.get(ing)
         if sub_name:
             display = f"{sub_name} (instead of {ing})"
         else:
             display = ing
 
-        if ing in strikes:
+        if strikes_mask >> idx & 1:
             lines.append(f"- ~~{display}~~")
         else:
             lines.append(f"- {display}")
     return lines
 
 
-def format_steps_with_progress_markdown(
-    steps: List[str],
+def format_working_ingredients_markdown(
+    recipe_ingredients: List[str],
+    recipe_subs: Dict[str, str],
+    strikes_mask: int,
+) -> List[str]:
+    """Return markdown lines (bullets) for current ingredient state.
+
+    Strikes are a bitmask over ingredient positions, so the struck check
+    is a bitwise AND instead of hashing the ingredient string per row.
+    Rendered lines are memoized on (ingredients, subs, mask): Streamlit
+    reruns this on every chat turn, but the inputs only change when a sub
+    or strike is added, so most calls are a cache hit.
+    """
+    return _render_working_ingredients(
+        tuple(recipe_ingredients),
+        tuple(sorted(recipe_subs.items())),
+        strikes_mask,
+    )
+
+
+@lru_cache(maxsize=64)
+def _render_steps_with_progress(
+    steps: Tuple[str, ...],
     current_step: int,
 ) -> List[str]:
-    """Return markdown lines for all steps, with completed ones struck through."""
     lines: List[str] = []
     for idx, step in enumerate(steps):
         if idx < current_step:
             lines.append(f"{idx + 1}. ~~{step}~~")
         else:
             lines.append(f"{idx + 1}. {step}")
-    return lines
\ No newline at end of file
+    return lines
+
+
+def format_steps_with_progress_markdown(
+    steps: List[str],
+    current_step: int,
+) -> List[str]:
+    """Return markdown lines for all steps, with completed ones struck through.
+
+    Memoized on (steps, current_step) like the ingredients helper: the
+    inputs only change when the user advances a step.
+    """
+    return _render_steps_with_progress(tuple(steps), current_step)
\ No newline at end of file